@@ -3,17 +3,28 @@ API module to fetch cryptocurrency data from exchanges using CCXT
 No API keys needed - uses public endpoints
 """
 
+import asyncio
+
 import ccxt
-from datetime import datetime, timedelta
+import ccxt.async_support as ccxt_async
+import numpy as np
 import time
 
+# One exchange for the whole process: every CryptoAPI handle shares its
+# requests.Session, so HTTP keep-alive amortizes TCP+TLS setup across
+# all callers, and the markets download is paid once instead of once
+# per instance (ccxt loads markets lazily on the first fetch)
+_EXCHANGE = ccxt.binance({'enableRateLimit': True})
+
 
 class CryptoAPI:
     """Handles all cryptocurrency API calls"""
-    
+
+    __slots__ = ('exchange', 'symbols_map')
+
     def __init__(self):
         # Using Binance - free, no API key needed
-        self.exchange = ccxt.binance()
+        self.exchange = _EXCHANGE
         self.symbols_map = {
             'BTC': 'BTC/USDT',
             'ETH': 'ETH/USDT',
@@ -35,6 +46,29 @@ class CryptoAPI:
             'UNI': 'UNI/USDT'
         }
     
+    def _ticker_to_dict(self, symbol, ticker, now=None):
+        """
+        Convert a raw ccxt ticker into the result shape callers expect
+        Bulk callers pass one batch-scope 'now' instead of re-reading
+        the clock per symbol
+        """
+        return {
+            'symbol': symbol,
+            'price': ticker['last'],
+            'high_24h': ticker['high'],
+            'low_24h': ticker['low'],
+            'volume': ticker['quoteVolume'],
+            'bid': ticker['bid'],
+            'ask': ticker['ask'],
+            # Epoch float - much cheaper than ISO strings to produce and
+            # compare; convert to ISO only at display time
+            'timestamp': now if now is not None else time.time(),
+            # Numeric default so sort/compare keys never mix types
+            # (ccxt sets 'percentage' to None when the exchange omits
+            # it, so a plain .get() default wouldn't fire)
+            'change_percent': ticker.get('percentage') or 0.0
+        }
+
     def fetch_ticker(self, symbol):
         """
         Fetch current price and market data
@@ -42,23 +76,14 @@ class CryptoAPI:
         Returns: dict with price, volume, 24h change
         """
         try:
-            if symbol not in self.symbols_map:
+            # Single dict lookup doubles as the membership check
+            trading_pair = self.symbols_map.get(symbol)
+            if trading_pair is None:
                 raise ValueError(f"Symbol {symbol} not supported")
-            
-            trading_pair = self.symbols_map[symbol]
+
             ticker = self.exchange.fetch_ticker(trading_pair)
-            
-            return {
-                'symbol': symbol,
-                'price': ticker['last'],
-                'high_24h': ticker['high'],
-                'low_24h': ticker['low'],
-                'volume': ticker['quoteVolume'],
-                'bid': ticker['bid'],
-                'ask': ticker['ask'],
-                'timestamp': datetime.now().isoformat(),
-                'change_percent': ticker.get('percentage', 'N/A')
-            }
+
+            return self._ticker_to_dict(symbol, ticker)
         except Exception as e:
             raise Exception(f"Error fetching {symbol}: {str(e)}")
     
@@ -66,34 +91,38 @@ class CryptoAPI:
         """
         Fetch historical OHLCV data (Open, High, Low, Close, Volume)
         Args: symbol (str), days (int)
-        Returns: list of candles with price history
+        Returns: dict of numpy column arrays keyed by
+            'ts', 'date', 'open', 'high', 'low', 'close', 'volume'
         """
         try:
-            if symbol not in self.symbols_map:
+            trading_pair = self.symbols_map.get(symbol)
+            if trading_pair is None:
                 raise ValueError(f"Symbol {symbol} not supported")
-            
-            trading_pair = self.symbols_map[symbol]
-            
+
             # Fetch 1-day candles
             candles = self.exchange.fetch_ohlcv(
-                trading_pair, 
-                timeframe='1d', 
+                trading_pair,
+                timeframe='1d',
                 limit=days
             )
-            
-            historical_data = []
-            for candle in candles:
-                timestamp, o, h, l, c, v = candle
-                historical_data.append({
-                    'date': datetime.fromtimestamp(timestamp/1000).isoformat(),
-                    'open': o,
-                    'high': h,
-                    'low': l,
-                    'close': c,
-                    'volume': v
-                })
-            
-            return historical_data
+
+            # Struct-of-arrays: one contiguous column per field instead
+            # of a dict per candle - far less memory and vectorized
+            # analytics come for free
+            cols = np.asarray(candles, dtype=np.float64).reshape(-1, 6)
+            ts = cols[:, 0].astype(np.int64)
+            # Dates are UTC, matching the exchange's candle boundaries
+            dates = ts.astype('datetime64[ms]').astype('datetime64[s]').astype(str)
+
+            return {
+                'ts': ts,
+                'date': dates,
+                'open': cols[:, 1],
+                'high': cols[:, 2],
+                'low': cols[:, 3],
+                'close': cols[:, 4],
+                'volume': cols[:, 5]
+            }
         except Exception as e:
             raise Exception(f"Error fetching historical data for {symbol}: {str(e)}")
     
@@ -108,9 +137,73 @@ class CryptoAPI:
         Returns: dict with all ticker data
         """
         results = {}
+        pair_to_symbol = {}
         for symbol in symbols:
-            try:
-                results[symbol] = self.fetch_ticker(symbol)
-            except Exception as e:
-                results[symbol] = {'error': str(e)}
+            trading_pair = self.symbols_map.get(symbol)
+            if trading_pair is not None:
+                pair_to_symbol[trading_pair] = symbol
+            else:
+                results[symbol] = {'error': f"Symbol {symbol} not supported"}
+
+        if not pair_to_symbol:
+            return results
+
+        # One batched call returns every requested ticker in a single
+        # round trip instead of one HTTPS request per symbol
+        try:
+            raw = self.exchange.fetch_tickers(list(pair_to_symbol.keys()))
+        except Exception as e:
+            for symbol in pair_to_symbol.values():
+                results[symbol] = {'error': f"Error fetching {symbol}: {str(e)}"}
+            return results
+
+        now = time.time()
+        for trading_pair, symbol in pair_to_symbol.items():
+            ticker = raw.get(trading_pair)
+            if ticker is None:
+                results[symbol] = {'error': f"Error fetching {symbol}: no ticker returned"}
+            else:
+                results[symbol] = self._ticker_to_dict(symbol, ticker, now)
+        return results
+
+    async def fetch_ticker_async(self, symbol, exchange):
+        """
+        Async version of fetch_ticker using a shared async exchange
+        Args: symbol (str), exchange - ccxt.async_support exchange instance
+        Returns: dict with price, volume, 24h change
+        """
+        try:
+            trading_pair = self.symbols_map.get(symbol)
+            if trading_pair is None:
+                raise ValueError(f"Symbol {symbol} not supported")
+
+            ticker = await exchange.fetch_ticker(trading_pair)
+
+            return self._ticker_to_dict(symbol, ticker)
+        except Exception as e:
+            raise Exception(f"Error fetching {symbol}: {str(e)}")
+
+    async def fetch_multiple_tickers_async(self, symbols):
+        """
+        Fetch multiple tickers concurrently on one shared HTTP session
+        Args: symbols (list) - ['BTC', 'ETH', 'XRP']
+        Returns: dict with all ticker data
+        """
+        # One async exchange per batch: all requests share its session,
+        # so TCP+TLS setup is paid once instead of once per symbol
+        exchange = ccxt_async.binance({'enableRateLimit': True})
+        try:
+            outcomes = await asyncio.gather(
+                *[self.fetch_ticker_async(symbol, exchange) for symbol in symbols],
+                return_exceptions=True
+            )
+        finally:
+            await exchange.close()
+
+        results = {}
+        for symbol, outcome in zip(symbols, outcomes):
+            if isinstance(outcome, Exception):
+                results[symbol] = {'error': str(outcome)}
+            else:
+                results[symbol] = outcome
         return results
\ No newline at end of file
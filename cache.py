@@ -5,100 +5,281 @@ Reduces API calls and improves performance
 
 import json
 import os
-from datetime import datetime, timedelta
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+
+from cachetools import TTLCache
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    # orjson serializes several times faster than stdlib json
+    def _dumps(obj):
+        return orjson.dumps(obj).decode()
+    _loads = orjson.loads
+else:
+    def _dumps(obj):
+        return json.dumps(obj, separators=(',', ':'))
+    _loads = json.loads
+
+
+class Backend(ABC):
+    """Storage backend for cache entries"""
+
+    __slots__ = ()
+
+    @abstractmethod
+    def fetch(self, symbol):
+        """Return (data, ts) for a symbol, or None if missing"""
+
+    @abstractmethod
+    def store(self, symbol, data, ts):
+        """Store data for a symbol with its save-time epoch timestamp"""
+
+    def store_many(self, entries, ts):
+        """Store several symbol -> data entries with one timestamp"""
+        for symbol, data in entries.items():
+            self.store(symbol, data, ts)
+
+    @abstractmethod
+    def delete(self, symbol):
+        """Remove a symbol if present"""
+
+    @abstractmethod
+    def clear(self):
+        """Remove all entries"""
+
+    @abstractmethod
+    def symbols(self):
+        """Return list of stored symbols"""
+
+    def flush(self):
+        """Persist pending writes (no-op for non-durable backends)"""
+
+    def close(self):
+        """Release any resources held by the backend"""
+
+
+class InMemoryBackend(Backend):
+    """Plain in-process dict - fastest option, no persistence"""
+
+    __slots__ = ('_data',)
+
+    def __init__(self):
+        self._data = {}
+
+    def fetch(self, symbol):
+        return self._data.get(symbol)
+
+    def store(self, symbol, data, ts):
+        self._data[symbol] = (data, ts)
+
+    def delete(self, symbol):
+        self._data.pop(symbol, None)
+
+    def clear(self):
+        self._data = {}
+
+    def symbols(self):
+        return list(self._data.keys())
+
+
+class SQLiteBackend(Backend):
+    """SQLite-backed store - O(1) upserts, survives restarts"""
+
+    __slots__ = ('_conn',)
+
+    def __init__(self, path):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        # WAL + NORMAL: readers don't block the writer and commits skip
+        # the full fsync, which is fine for a cache
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache('
+            'symbol TEXT PRIMARY KEY, data TEXT, ts REAL)'
+        )
+        self._conn.commit()
+
+    def fetch(self, symbol):
+        row = self._conn.execute(
+            'SELECT data, ts FROM cache WHERE symbol = ?', (symbol,)
+        ).fetchone()
+        if row is None:
+            return None
+        return _loads(row[0]), row[1]
+
+    def store(self, symbol, data, ts):
+        self._conn.execute(
+            'INSERT OR REPLACE INTO cache(symbol, data, ts) VALUES (?, ?, ?)',
+            (symbol, _dumps(data), ts)
+        )
+        self._conn.commit()
+
+    def store_many(self, entries, ts):
+        # executemany with a single commit instead of one transaction
+        # per symbol
+        self._conn.executemany(
+            'INSERT OR REPLACE INTO cache(symbol, data, ts) VALUES (?, ?, ?)',
+            [(symbol, _dumps(data), ts) for symbol, data in entries.items()]
+        )
+        self._conn.commit()
+
+    def delete(self, symbol):
+        self._conn.execute('DELETE FROM cache WHERE symbol = ?', (symbol,))
+        self._conn.commit()
+
+    def clear(self):
+        self._conn.execute('DELETE FROM cache')
+        self._conn.commit()
+
+    def symbols(self):
+        rows = self._conn.execute('SELECT symbol FROM cache').fetchall()
+        return [row[0] for row in rows]
+
+    def flush(self):
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
 
 
 class CacheManager:
     """Manages caching of cryptocurrency data"""
-    
-    def __init__(self, cache_file='data/cache.json', ttl_minutes=5):
+
+    __slots__ = ('cache_file', 'ttl_minutes', 'backend', '_hot', '_stale')
+
+    def __init__(self, cache_file='data/cache.db', ttl_minutes=5, backend=None):
         """
         Initialize cache manager
         Args:
-            cache_file (str): Path to cache file
+            cache_file (str): Path for the default SQLite backend
             ttl_minutes (int): Time to live for cached data (5 min default)
+            backend (Backend): Storage backend, e.g. InMemoryBackend()
+                when persistence isn't needed (defaults to SQLite)
         """
         self.cache_file = cache_file
         self.ttl_minutes = ttl_minutes
-        self.cache_data = self._load_cache()
-    
-    def _ensure_data_dir(self):
-        """Create data directory if it doesn't exist"""
-        os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
-    
-    def _load_cache(self):
-        """Load cache from JSON file"""
-        self._ensure_data_dir()
-        
-        if os.path.exists(self.cache_file):
-            try:
-                with open(self.cache_file, 'r') as f:
-                    return json.load(f)
-            except:
-                return {}
-        return {}
-    
-    def _save_cache(self):
-        """Save cache to JSON file"""
-        self._ensure_data_dir()
-        with open(self.cache_file, 'w') as f:
-            json.dump(self.cache_data, f, indent=2)
-    
-    def _is_expired(self, timestamp_str):
-        """Check if cached data has expired"""
-        try:
-            cached_time = datetime.fromisoformat(timestamp_str)
-            expiry_time = cached_time + timedelta(minutes=self.ttl_minutes)
-            return datetime.now() > expiry_time
-        except:
-            return True
-    
+        self.backend = backend if backend is not None else SQLiteBackend(cache_file)
+        # Hot layer in front of the backend: O(1) lookups, so repeat
+        # hits never touch the storage backend. Holds (data, ts) tuples
+        # and expiry is always checked against the save-time ts - the
+        # TTLCache ttl only bounds how long entries occupy memory
+        self._hot = TTLCache(maxsize=256, ttl=ttl_minutes * 60)
+        # Last known value per symbol - never expired, only overwritten
+        # on successful save, so callers can serve stale data when the
+        # exchange is unavailable
+        self._stale = {}
+
+    def _is_expired(self, ts):
+        """Check if a save-time epoch timestamp has expired"""
+        return (time.time() - ts) > self.ttl_minutes * 60
+
     def get(self, symbol):
         """
         Get cached data for a symbol
         Args: symbol (str) - 'BTC', 'ETH', etc.
         Returns: dict if valid cache exists, None if expired or missing
         """
-        if symbol not in self.cache_data:
+        entry = self._hot.get(symbol)
+        if entry is not None:
+            data, ts = entry
+            if not self._is_expired(ts):
+                return data
+            # The hot tuple may lag the backend (another manager on the
+            # same file can have saved a fresher row), so only drop the
+            # local copy and let the backend's own ts decide below
+            self._hot.pop(symbol, None)
+
+        entry = self.backend.fetch(symbol)
+        if entry is None:
             return None
-        
-        cached_entry = self.cache_data[symbol]
-        
-        if self._is_expired(cached_entry.get('timestamp', '')):
+
+        data, ts = entry
+
+        if self._is_expired(ts):
             # Remove expired entry
-            del self.cache_data[symbol]
-            self._save_cache()
+            self.backend.delete(symbol)
             return None
-        
-        return cached_entry
-    
+
+        # Promote with the original save time so the entry still
+        # expires on schedule, not a full TTL after promotion
+        self._hot[symbol] = (data, ts)
+        return data
+
+    def get_many(self, symbols):
+        """
+        Get cached data for several symbols at once
+        Args: symbols (list) - ['BTC', 'ETH', 'XRP']
+        Returns: dict of symbol -> data (None if expired or missing)
+        """
+        return {symbol: self.get(symbol) for symbol in symbols}
+
     def save(self, symbol, data):
         """
         Save data to cache
         Args: symbol (str), data (dict)
         """
-        self.cache_data[symbol] = data
-        self._save_cache()
-    
+        ts = time.time()
+        self._hot[symbol] = (data, ts)
+        self._stale[symbol] = data
+        self.backend.store(symbol, data, ts)
+
+    def save_many(self, entries):
+        """
+        Save several symbol -> data entries in one backend write
+        Args: entries (dict) - {'BTC': {...}, 'ETH': {...}}
+        """
+        ts = time.time()
+        for symbol, data in entries.items():
+            self._hot[symbol] = (data, ts)
+        self._stale.update(entries)
+        self.backend.store_many(entries, ts)
+
+    def get_stale(self, symbol):
+        """
+        Get the last known value for a symbol, ignoring expiration
+        Args: symbol (str)
+        Returns: dict if the symbol was ever saved, None otherwise
+        """
+        return self._stale.get(symbol)
+
     def clear(self, symbol=None):
         """
         Clear cache for specific symbol or all
         Args: symbol (str) - None to clear all
         """
         if symbol:
-            if symbol in self.cache_data:
-                del self.cache_data[symbol]
+            self._hot.pop(symbol, None)
+            self._stale.pop(symbol, None)
+            self.backend.delete(symbol)
         else:
-            self.cache_data = {}
-        
-        self._save_cache()
-    
+            self._hot.clear()
+            self._stale = {}
+            self.backend.clear()
+
+    def flush(self):
+        """Persist any pending writes to the backend"""
+        self.backend.flush()
+
+    def close(self):
+        """Close the backend (e.g. the SQLite connection)"""
+        self.backend.close()
+
     def get_cache_info(self):
         """Get information about cached data"""
+        cached_symbols = self.backend.symbols()
         info = {
             'file': self.cache_file,
             'ttl_minutes': self.ttl_minutes,
-            'cached_symbols': list(self.cache_data.keys()),
-            'total_entries': len(self.cache_data)
+            'backend': type(self.backend).__name__,
+            'cached_symbols': cached_symbols,
+            'total_entries': len(cached_symbols)
         }
-        return info
\ No newline at end of file
+        return info
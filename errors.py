@@ -3,15 +3,39 @@ Error handling module for the MCP server
 Provides graceful error handling and logging
 """
 
+import atexit
 import json
+import os
+import re
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 2-10 uppercase alphanumerics - one C-level match instead of separate
+# length and case checks
+_SYMBOL_RE = re.compile(r'^[A-Z0-9]{2,10}$')
+
 
 class ErrorHandler:
     """Handles and logs errors gracefully"""
-    
+
+    __slots__ = ('log_file', '_fh')
+
     def __init__(self, log_file='data/errors.log'):
         self.log_file = log_file
+        # Resolve the log directory and open the file once up front;
+        # line buffering flushes each entry without a reopen per error
+        try:
+            log_dir = os.path.dirname(log_file)
+            if log_dir:
+                os.makedirs(log_dir, exist_ok=True)
+            self._fh = open(log_file, 'a', buffering=1)
+            atexit.register(self._fh.close)
+        except:
+            self._fh = None  # Logging disabled, errors still printed
     
     def handle(self, exception, context="Unknown"):
         """
@@ -35,13 +59,15 @@ class ErrorHandler:
         return error_response
     
     def _log_error(self, error_info):
-        """Log error to file"""
+        """Append error to the already-open log file"""
+        if self._fh is None:
+            return
         try:
-            import os
-            os.makedirs(os.path.dirname(self.log_file), exist_ok=True)
-            
-            with open(self.log_file, 'a') as f:
-                f.write(json.dumps(error_info) + '\n')
+            if orjson is not None:
+                line = orjson.dumps(error_info).decode()
+            else:
+                line = json.dumps(error_info)
+            self._fh.write(line + '\n')
         except:
             pass  # Silently fail if logging fails
     
@@ -54,12 +80,8 @@ class ErrorHandler:
     
     def validate_symbol(self, symbol):
         """Validate if symbol is in correct format"""
-        if not isinstance(symbol, str):
-            raise ValueError("Symbol must be a string")
-        if len(symbol) < 2 or len(symbol) > 10:
-            raise ValueError("Symbol must be 2-10 characters")
-        if not symbol.isupper():
-            raise ValueError("Symbol must be uppercase")
+        if not isinstance(symbol, str) or not _SYMBOL_RE.match(symbol):
+            raise ValueError("Symbol must be 2-10 uppercase characters")
         return True
     
     def validate_days(self, days):
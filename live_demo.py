@@ -3,18 +3,25 @@ Live Demo - Shows ALL cryptocurrencies with real-time data
 Run this to see all crypto prices at once (LIVE, not cached)
 """
 
+import heapq
 import json
+import sys
 from datetime import datetime
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from api import CryptoAPI
-from cache import CacheManager
 
 
 class LiveCryptoDemo:
     """Live cryptocurrency data demonstration"""
-    
+
+    __slots__ = ('api',)
+
     def __init__(self):
         self.api = CryptoAPI()
-        self.cache = CacheManager()
     
     def show_all_live_prices(self):
         """Fetch and display ALL cryptocurrency prices LIVE"""
@@ -26,32 +33,33 @@ class LiveCryptoDemo:
         
         symbols = self.api.get_supported_symbols()
         print(f"📊 Fetching LIVE prices for {len(symbols)} cryptocurrencies...\n")
+
+        # Fetching straight from the API already bypasses the cache, so
+        # there's no need to destroy it for other clients
+        # One batched exchange call fetches every ticker in a single round trip
+        all_data = self.api.fetch_multiple_tickers(symbols)
+
+        # Render everything into one buffer and emit it with a single
+        # write instead of dozens of line-flushed print() calls
+        total = len(symbols)
+        lines = []
+
+        for i, (symbol, data) in enumerate(all_data.items(), 1):
+            if 'error' in data:
+                lines.append(f"[{i}/{total}] {symbol}: ❌ Error: {data['error']}")
+                continue
+
+            price = data['price']
+            change = data['change_percent']
+            arrow = "📈" if change > 0 else "📉" if change < 0 else "➡️"
+
+            lines.append(f"[{i}/{total}] {symbol}: ✓ ${price:,.2f} {arrow} ({change:+.2f}%)")
         
-        # Clear cache to force fresh data
-        self.cache.clear()
-        
-        all_data = {}
-        
-        for i, symbol in enumerate(symbols, 1):
-            try:
-                print(f"[{i}/{len(symbols)}] Fetching {symbol}...", end=" ", flush=True)
-                data = self.api.fetch_ticker(symbol)
-                all_data[symbol] = data
-                
-                price = data['price']
-                change = data['change_percent']
-                arrow = "📈" if change > 0 else "📉" if change < 0 else "➡️"
-                
-                print(f"✓ ${price:,.2f} {arrow} ({change:+.2f}%)")
-                
-            except Exception as e:
-                print(f"❌ Error: {str(e)}")
-        
-        print("\n" + "="*70)
-        print("📋 SUMMARY TABLE - ALL CRYPTOCURRENCIES")
-        print("="*70)
-        print(f"{'Symbol':<10} {'Price (USDT)':<18} {'24h High':<18} {'24h Low':<18} {'Change %':<12}")
-        print("-"*70)
+        lines.append("\n" + "="*70)
+        lines.append("📋 SUMMARY TABLE - ALL CRYPTOCURRENCIES")
+        lines.append("="*70)
+        lines.append(f"{'Symbol':<10} {'Price (USDT)':<18} {'24h High':<18} {'24h Low':<18} {'Change %':<12}")
+        lines.append("-"*70)
         
         for symbol, data in all_data.items():
             if 'error' not in data:
@@ -60,11 +68,12 @@ class LiveCryptoDemo:
                 high_str = f"${data['high_24h']:>15,.2f}"
                 low_str = f"${data['low_24h']:>15,.2f}"
                 change_str = f"{data['change_percent']:>10.2f}%"
-                
-                print(f"{symbol_str} {price_str} {high_str} {low_str} {change_str}")
-        
-        print("="*70 + "\n")
-        
+
+                lines.append(f"{symbol_str} {price_str} {high_str} {low_str} {change_str}")
+
+        lines.append("="*70 + "\n")
+        sys.stdout.write('\n'.join(lines) + '\n')
+
         # Save to JSON file
         self._save_live_data(all_data)
         
@@ -77,9 +86,6 @@ class LiveCryptoDemo:
         print("="*70 + "\n")
         
         try:
-            # Clear cache for fresh data
-            self.cache.clear(symbol)
-            
             data = self.api.fetch_ticker(symbol)
             
             print(f"Symbol:           {data['symbol']}")
@@ -90,7 +96,7 @@ class LiveCryptoDemo:
             print(f"Bid Price:        ${data['bid']:,.2f}")
             print(f"Ask Price:        ${data['ask']:,.2f}")
             print(f"Volume (24h):     ${data['volume']:,.0f}")
-            print(f"Updated:          {data['timestamp']}")
+            print(f"Updated:          {datetime.fromtimestamp(data['timestamp']).isoformat()}")
             
             print("\n" + "="*70)
             print("📈 HISTORICAL DATA (Last 7 Days)")
@@ -99,14 +105,14 @@ class LiveCryptoDemo:
             print("-"*70)
             
             history = self.api.fetch_historical(symbol, days=7)
-            
-            for candle in history:
-                date = candle['date'][:10]  # Just the date part
-                open_price = f"${candle['open']:,.2f}"
-                high = f"${candle['high']:,.2f}"
-                low = f"${candle['low']:,.2f}"
-                close = f"${candle['close']:,.2f}"
-                
+
+            for i in range(len(history['close'])):
+                date = history['date'][i][:10]  # Just the date part
+                open_price = f"${history['open'][i]:,.2f}"
+                high = f"${history['high'][i]:,.2f}"
+                low = f"${history['low'][i]:,.2f}"
+                close = f"${history['close'][i]:,.2f}"
+
                 print(f"{date:<25} {open_price:<15} {high:<15} {low:<15} {close:<15}")
             
             print("\n" + "="*70 + "\n")
@@ -120,17 +126,14 @@ class LiveCryptoDemo:
         print(f"🚀 TOP {top_n} GAINERS (24h)")
         print("="*70 + "\n")
         
-        sorted_data = sorted(
-            all_data.items(),
-            key=lambda x: x[1].get('change_percent', 0),
-            reverse=True
-        )
-        
-        for i, (symbol, data) in enumerate(sorted_data[:top_n], 1):
-            if 'error' not in data:
-                change = data['change_percent']
-                price = data['price']
-                print(f"{i}. {symbol:<8} ${price:>12,.2f}  📈 +{change:.2f}%")
+        # Single O(N log K) pass instead of a full sort
+        valid = [(s, d) for s, d in all_data.items() if 'error' not in d]
+        top = heapq.nlargest(top_n, valid, key=lambda x: x[1].get('change_percent', 0))
+
+        for i, (symbol, data) in enumerate(top, 1):
+            change = data['change_percent']
+            price = data['price']
+            print(f"{i}. {symbol:<8} ${price:>12,.2f}  📈 +{change:.2f}%")
         
         print("\n")
     
@@ -140,16 +143,14 @@ class LiveCryptoDemo:
         print(f"📉 TOP {top_n} LOSERS (24h)")
         print("="*70 + "\n")
         
-        sorted_data = sorted(
-            all_data.items(),
-            key=lambda x: x[1].get('change_percent', 0)
-        )
-        
-        for i, (symbol, data) in enumerate(sorted_data[:top_n], 1):
-            if 'error' not in data:
-                change = data['change_percent']
-                price = data['price']
-                print(f"{i}. {symbol:<8} ${price:>12,.2f}  📉 {change:.2f}%")
+        # Single O(N log K) pass instead of a full sort
+        valid = [(s, d) for s, d in all_data.items() if 'error' not in d]
+        bottom = heapq.nsmallest(top_n, valid, key=lambda x: x[1].get('change_percent', 0))
+
+        for i, (symbol, data) in enumerate(bottom, 1):
+            change = data['change_percent']
+            price = data['price']
+            print(f"{i}. {symbol:<8} ${price:>12,.2f}  📉 {change:.2f}%")
         
         print("\n")
     
@@ -157,8 +158,13 @@ class LiveCryptoDemo:
         """Save live data to JSON file"""
         output_file = 'data/live_prices.json'
         try:
-            with open(output_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            if orjson is not None:
+                # orjson writes bytes directly - much faster than json.dump
+                with open(output_file, 'wb') as f:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(output_file, 'w') as f:
+                    json.dump(data, f, indent=2)
             print(f"💾 Live data saved to: {output_file}")
         except Exception as e:
             print(f"⚠️  Could not save file: {str(e)}")
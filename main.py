@@ -5,6 +5,9 @@ Starts the server and handles real-time crypto data requests
 
 import json
 from datetime import datetime
+
+from cachetools import TTLCache
+
 from api import CryptoAPI
 from cache import CacheManager
 from errors import ErrorHandler
@@ -12,24 +15,31 @@ from errors import ErrorHandler
 
 class MCPServer:
     """Main MCP Server for cryptocurrency data"""
+
+    __slots__ = ('api', 'cache', 'error_handler', 'history_cache')
     
     def __init__(self):
         self.api = CryptoAPI()
         self.cache = CacheManager()
         self.error_handler = ErrorHandler()
+        # Daily candles are stable for hours, so history gets its own
+        # longer-lived cache keyed by (symbol, days)
+        self.history_cache = TTLCache(maxsize=512, ttl=1800)
     
-    def get_current_price(self, symbol):
+    def get_current_price(self, symbol, force=False):
         """
         Get current price of cryptocurrency
         Args: symbol (str) - Like 'BTC', 'ETH', 'XRP'
+              force (bool) - Skip the cache read and fetch fresh data
         Returns: dict with price and timestamp
         """
         try:
-            # Check cache first
-            cached = self.cache.get(symbol)
-            if cached:
-                print(f"✓ Got {symbol} from cache")
-                return cached
+            # Check cache first (unless the caller wants fresh data)
+            if not force:
+                cached = self.cache.get(symbol)
+                if cached:
+                    print(f"✓ Got {symbol} from cache")
+                    return cached
             
             # If not in cache, fetch from API
             price_data = self.api.fetch_ticker(symbol)
@@ -38,8 +48,13 @@ class MCPServer:
             self.cache.save(symbol, price_data)
             print(f"✓ Fetched {symbol} from exchange and cached")
             return price_data
-            
+
         except Exception as e:
+            # Stale-while-error: a last known price beats no price
+            stale = self.cache.get_stale(symbol)
+            if stale is not None:
+                print(f"⚠️  Serving stale {symbol} data after fetch error")
+                return {**stale, 'is_stale': True, 'stale_error': str(e)}
             return self.error_handler.handle(e, symbol)
     
     def get_multiple_prices(self, symbols):
@@ -48,30 +63,76 @@ class MCPServer:
         Args: symbols (list) - ['BTC', 'ETH', 'XRP']
         Returns: dict with all prices
         """
-        results = {}
-        for symbol in symbols:
-            results[symbol] = self.get_current_price(symbol)
+        cached = self.cache.get_many(symbols)
+        results = {symbol: data for symbol, data in cached.items() if data is not None}
+        misses = [symbol for symbol, data in cached.items() if data is None]
+
+        if misses:
+            # One batched request covers every cache miss, and one
+            # batched write saves all the fresh entries
+            fresh = self.api.fetch_multiple_tickers(misses)
+            good = {symbol: data for symbol, data in fresh.items() if 'error' not in data}
+            if good:
+                self.cache.save_many(good)
+            results.update(good)
+
+            # Failed symbols get the same treatment as the single-symbol
+            # path: stale-while-error first, error handler otherwise
+            for symbol, data in fresh.items():
+                if 'error' in data:
+                    stale = self.cache.get_stale(symbol)
+                    if stale is not None:
+                        print(f"⚠️  Serving stale {symbol} data after fetch error")
+                        results[symbol] = {**stale, 'is_stale': True, 'stale_error': data['error']}
+                    else:
+                        results[symbol] = self.error_handler.handle(Exception(data['error']), symbol)
         return results
     
     def get_historical_data(self, symbol, days=7):
         """
         Get historical price data
         Args: symbol (str), days (int)
-        Returns: list of historical prices
+        Returns: dict of numpy column arrays (see CryptoAPI.fetch_historical)
         """
         try:
+            key = (symbol, days)
+            cached = self.history_cache.get(key)
+            if cached is not None:
+                print(f"✓ Got {days} days of historical data for {symbol} from cache")
+                return cached
+
             data = self.api.fetch_historical(symbol, days)
+            self.history_cache[key] = data
             print(f"✓ Got {days} days of historical data for {symbol}")
             return data
         except Exception as e:
             return self.error_handler.handle(e, f"{symbol} (historical)")
     
+    def prefetch_all(self):
+        """
+        Warm the cache for every supported symbol with one bulk fetch
+        so the first user queries hit the cache instead of the exchange
+        """
+        try:
+            symbols = self.api.get_supported_symbols()
+            fresh = self.api.fetch_multiple_tickers(symbols)
+            good = {symbol: data for symbol, data in fresh.items() if 'error' not in data}
+            if good:
+                self.cache.save_many(good)
+            print(f"✓ Pre-warmed cache for {len(good)}/{len(symbols)} symbols")
+        except Exception as e:
+            self.error_handler.handle(e, "cache prefetch")
+
     def start(self):
         """Start the MCP server"""
         print("=" * 50)
         print("🚀 Cryptocurrency MCP Server Started")
         print("=" * 50)
-        
+
+        # Warm the cache with a single bulk request
+        print("\n🔥 Pre-warming cache...")
+        self.prefetch_all()
+
         # Example usage
         print("\n📊 Fetching live prices...")
         btc = self.get_current_price('BTC')
@@ -82,7 +143,8 @@ class MCPServer:
         
         print("\n📈 Fetching historical data (last 5 days)...")
         history = self.get_historical_data('BTC', days=5)
-        print(f"Historical data points: {len(history)}")
+        if 'error' not in history:
+            print(f"Historical data points: {len(history['close'])}")
         
         print("\n✅ Server running successfully!")
 
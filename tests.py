@@ -4,12 +4,14 @@ Tests all core functionality
 """
 
 import unittest
-import json
+import glob
 import os
+import time
 from datetime import datetime
 from api import CryptoAPI
-from cache import CacheManager
+from cache import CacheManager, InMemoryBackend
 from errors import ErrorHandler
+from main import MCPServer
 
 
 class TestCryptoAPI(unittest.TestCase):
@@ -63,11 +65,11 @@ class TestCryptoAPI(unittest.TestCase):
         """Test fetching historical data"""
         try:
             history = self.api.fetch_historical('BTC', days=5)
-            self.assertIsInstance(history, list)
-            self.assertGreater(len(history), 0)
-            self.assertIn('date', history[0])
-            self.assertIn('close', history[0])
-            print(f"✓ Historical data test passed - Got {len(history)} data points")
+            self.assertIsInstance(history, dict)
+            self.assertIn('date', history)
+            self.assertIn('close', history)
+            self.assertGreater(len(history['close']), 0)
+            print(f"✓ Historical data test passed - Got {len(history['close'])} data points")
         except Exception as e:
             self.fail(f"Historical data fetch failed: {str(e)}")
     
@@ -87,12 +89,13 @@ class TestCacheManager(unittest.TestCase):
     """Test CacheManager class"""
     
     def setUp(self):
-        self.cache = CacheManager('data/test_cache.json', ttl_minutes=60)
-    
+        self.cache = CacheManager('data/test_cache.db', ttl_minutes=60)
+
     def tearDown(self):
-        """Clean up test cache file"""
-        if os.path.exists('data/test_cache.json'):
-            os.remove('data/test_cache.json')
+        """Close connections and clean up test cache files (incl. WAL sidecars)"""
+        self.cache.close()
+        for path in glob.glob('data/test_cache*'):
+            os.remove(path)
     
     def test_save_and_get(self):
         """Test saving and retrieving cache"""
@@ -105,13 +108,14 @@ class TestCacheManager(unittest.TestCase):
     
     def test_cache_expiration(self):
         """Test cache expiration"""
-        cache_short = CacheManager('data/test_cache2.json', ttl_minutes=0)
+        cache_short = CacheManager('data/test_cache2.db', ttl_minutes=0)
         test_data = {'price': 45000, 'timestamp': datetime.now().isoformat()}
         cache_short.save('BTC', test_data)
-        
+
         # Should be expired
         retrieved = cache_short.get('BTC')
         self.assertIsNone(retrieved)
+        cache_short.close()
         print("✓ Cache expiration test passed")
     
     def test_cache_clear(self):
@@ -124,13 +128,116 @@ class TestCacheManager(unittest.TestCase):
         print("✓ Cache clear test passed")
     
     def test_cache_file_creation(self):
-        """Test if cache file is created"""
+        """Test if cache file is created on flush"""
         test_data = {'price': 45000, 'timestamp': datetime.now().isoformat()}
         self.cache.save('BTC', test_data)
-        
-        self.assertTrue(os.path.exists('data/test_cache.json'))
+        self.cache.flush()
+
+        self.assertTrue(os.path.exists('data/test_cache.db'))
         print("✓ Cache file creation test passed")
 
+    def test_sqlite_persistence(self):
+        """Test that cached data survives a new manager on the same file"""
+        self.cache.save('BTC', {'price': 45000, 'symbol': 'BTC'})
+        self.cache.close()
+
+        reopened = CacheManager('data/test_cache.db', ttl_minutes=60)
+        retrieved = reopened.get('BTC')
+        self.assertEqual(retrieved['price'], 45000)
+        reopened.close()
+        print("✓ SQLite persistence test passed")
+
+    def test_in_memory_backend(self):
+        """Test the non-persistent in-memory backend"""
+        cache = CacheManager(backend=InMemoryBackend(), ttl_minutes=60)
+        cache.save('ETH', {'price': 3000})
+        self.assertEqual(cache.get('ETH')['price'], 3000)
+
+        cache.clear()
+        self.assertIsNone(cache.get('ETH'))
+        print("✓ In-memory backend test passed")
+
+    def test_save_many_and_get_many(self):
+        """Test batched save and batched probe"""
+        self.cache.save_many({'BTC': {'price': 45000}, 'ETH': {'price': 3000}})
+
+        results = self.cache.get_many(['BTC', 'ETH', 'XRP'])
+        self.assertEqual(results['BTC']['price'], 45000)
+        self.assertEqual(results['ETH']['price'], 3000)
+        self.assertIsNone(results['XRP'])
+        print("✓ Batched save/get test passed")
+
+    def test_get_stale(self):
+        """Test that the last known value survives TTL expiration"""
+        cache_short = CacheManager('data/test_cache2.db', ttl_minutes=0)
+        cache_short.save('BTC', {'price': 45000})
+
+        self.assertIsNone(cache_short.get('BTC'))
+        stale = cache_short.get_stale('BTC')
+        self.assertEqual(stale['price'], 45000)
+        cache_short.close()
+        print("✓ Stale retrieval test passed")
+
+    def test_promoted_entry_keeps_save_time(self):
+        """Test that hot-layer promotion doesn't extend an entry's TTL"""
+        cache_a = CacheManager('data/test_cache3.db', ttl_minutes=0.01)  # 0.6s TTL
+        cache_a.save('BTC', {'price': 45000})
+
+        # A second manager promotes the entry into its hot layer...
+        cache_b = CacheManager('data/test_cache3.db', ttl_minutes=0.01)
+        self.assertIsNotNone(cache_b.get('BTC'))
+
+        # ...but it must still expire on the original save-time schedule
+        time.sleep(0.7)
+        self.assertIsNone(cache_b.get('BTC'))
+        cache_a.close()
+        cache_b.close()
+        print("✓ Hot-layer promotion TTL test passed")
+
+
+class TestMCPServer(unittest.TestCase):
+    """Test MCPServer caching and fallback behavior (offline)"""
+
+    def setUp(self):
+        self.server = MCPServer()
+        # Swap in a zero-TTL test cache so every get is a miss
+        self.server.cache.close()
+        self.server.cache = CacheManager('data/test_server_cache.db', ttl_minutes=0)
+
+    def tearDown(self):
+        """Close connections and clean up test cache files"""
+        self.server.cache.close()
+        for path in glob.glob('data/test_server_cache*'):
+            os.remove(path)
+
+    def test_stale_served_on_fetch_error(self):
+        """Stale data is served when the fetch fails after expiry"""
+        # 'FAKE' is unsupported, so the API fetch always fails
+        self.server.cache.save('FAKE', {'price': 45000, 'symbol': 'FAKE'})
+
+        result = self.server.get_current_price('FAKE')
+        self.assertTrue(result.get('is_stale'))
+        self.assertEqual(result['price'], 45000)
+        self.assertIn('stale_error', result)
+        print("✓ Stale-while-error test passed")
+
+    def test_stale_served_in_batch(self):
+        """Batched misses fall back to stale data like the single path"""
+        self.server.cache.save('FAKE', {'price': 45000, 'symbol': 'FAKE'})
+
+        results = self.server.get_multiple_prices(['FAKE'])
+        self.assertTrue(results['FAKE'].get('is_stale'))
+        self.assertEqual(results['FAKE']['price'], 45000)
+        print("✓ Batched stale fallback test passed")
+
+    def test_batch_error_uses_handler_shape(self):
+        """Batched failures without stale data return the handler's dict"""
+        results = self.server.get_multiple_prices(['FAKE'])
+        self.assertTrue(results['FAKE']['error'])
+        self.assertIn('message', results['FAKE'])
+        self.assertIn('context', results['FAKE'])
+        print("✓ Batched error shape test passed")
+
 
 class TestErrorHandler(unittest.TestCase):
     """Test ErrorHandler class"""
@@ -179,6 +286,7 @@ def run_all_tests():
     
     suite.addTests(loader.loadTestsFromTestCase(TestCryptoAPI))
     suite.addTests(loader.loadTestsFromTestCase(TestCacheManager))
+    suite.addTests(loader.loadTestsFromTestCase(TestMCPServer))
     suite.addTests(loader.loadTestsFromTestCase(TestErrorHandler))
     
     runner = unittest.TextTestRunner(verbosity=2)